@@ -1,11 +1,21 @@
+import functools
+import itertools
 import json
 import os
+import queue
+import re
 import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
 
+import orjson
 import yt_dlp
-from PyQt6.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtCore import QCoreApplication, QObject, Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import (QApplication, QCheckBox, QComboBox, QFileDialog,
                              QGroupBox, QHeaderView, QLabel, QLineEdit, QMainWindow,
@@ -13,7 +23,17 @@ from PyQt6.QtWidgets import (QApplication, QCheckBox, QComboBox, QFileDialog,
                              QSpinBox, QTableWidget, QTableWidgetItem, QVBoxLayout,
                              QWidget, QHBoxLayout)
 
-HISTORY_FILENAME = "downloads-history.json"
+HISTORY_FILENAME = "downloads-history.jsonl"
+LEGACY_HISTORY_FILENAME = "downloads-history.json"
+HISTORY_LIMIT = 100
+HISTORY_BUFFER_SIZE = 1 << 16
+HISTORY_DRAIN_TIMEOUT = 0.1
+HISTORY_DRAIN_BATCH = 64
+HISTORY_FSYNC_INTERVAL = 1.0
+PROGRESS_EMIT_INTERVAL = 0.1
+PROGRESS_EMIT_STEP = 1.0
+PROGRESS_RENDER_INTERVAL = 0.25
+TERMINAL_STATUSES = frozenset(("finished", "error"))
 FORMAT_PRESETS = [
     "Smart (best combined)",
     "Video + Audio (muxed)",
@@ -22,9 +42,37 @@ FORMAT_PRESETS = [
     "Playlist (flat)",
 ]
 AUDIO_CODECS = ["mp3", "m4a", "wav", "opus"]
-
-
-@dataclass
+_FORMAT_MAP = {
+    "Smart (best combined)": ("bv*+ba/b", {}),
+    "Video + Audio (muxed)": ("bestvideo[ext=mp4]+bestaudio[ext=m4a]/best", {}),
+    "Audio only": ("bestaudio", {}),
+    "Subtitle + metadata": ("best", {"writesubtitles": True, "writeautomaticsub": True}),
+    "Playlist (flat)": ("bestaudio/best", {"flat_playlist": True}),
+}
+_DEFAULT_FORMAT = ("best", {})
+DEFAULT_FRAGMENT_CONCURRENCY = 4
+HTTP_CHUNK_SIZE = 10 << 20
+YDL_CACHE_SIZE = 8
+LOG_FLUSH_INTERVAL_MS = 50
+LOG_MAX_BLOCKS = 2000
+HISTORY_REFRESH_DELAY_MS = 250
+_STYLE_SHEET = """
+    QWidget { background-color: #0f1117; color: #f0f6ff; }
+    QLineEdit, QPlainTextEdit, QSpinBox, QComboBox { background-color: #1d2230; border: 1px solid #323c55; border-radius: 6px; padding: 4px; }
+    QTableWidget { gridline-color: #2f3649; }
+    QPushButton { background-color: #5c6cff; border-radius: 6px; padding: 8px 16px; color: white; }
+    QPushButton:hover { background-color: #4a54e1; }
+    QPushButton:pressed { background-color: #3c44bb; }
+"""
+_ITEM_FLAGS = Qt.ItemFlag.ItemIsEnabled
+_URL_SPLIT = re.compile(r"\S+")
+_HEADER_STYLE = "font-size: 24px; font-weight: 600; color: #c8d7ff;"
+_SECTION_LABEL_STYLE = "font-weight: 600; color: #b6c4ff;"
+_ENSURED_DIRS: Set[str] = set()
+_ENSURED_DIRS_LOCK = threading.Lock()
+
+
+@dataclass(slots=True)
 class DownloadTask:
     url: str
     output_dir: str
@@ -38,36 +86,42 @@ class DownloadTask:
     embed_metadata: bool
     keep_thumbnails: bool
     simulate: bool
+    fragment_concurrency: int = DEFAULT_FRAGMENT_CONCURRENCY
     status: str = "Queued"
     progress_label: str = ""
     eta: str = ""
     speed: str = ""
     id: int = field(default=0)
+    _subtitle_langs: List[str] = field(default_factory=list, init=False, repr=False)
+    _proxy: str = field(default="", init=False, repr=False)
+    _outtmpl: Dict[str, str] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._subtitle_langs = [lang.strip() for lang in self.subtitle_lang.split(",") if lang.strip()]
+        self._proxy = self.proxy.strip()
+        self._outtmpl = {"default": os.path.join(self.output_dir, self.filename_template or "%(title)s.%(ext)s")}
+
+    def _ensure_output_dir(self) -> None:
+        if self.output_dir in _ENSURED_DIRS:
+            return
+        with _ENSURED_DIRS_LOCK:
+            os.makedirs(self.output_dir, exist_ok=True)
+            _ENSURED_DIRS.add(self.output_dir)
 
     def build_options(self) -> Dict:
-        os.makedirs(self.output_dir, exist_ok=True)
+        self._ensure_output_dir()
         options: Dict = {
-            "outtmpl": os.path.join(self.output_dir, self.filename_template or "%(title)s.%(ext)s"),
+            "outtmpl": dict(self._outtmpl),
             "nopart": True,
             "noplaylist": False,
             "restrictfilenames": True,
-            "progress_hooks": [],
             "simulate": self.simulate,
+            "concurrent_fragment_downloads": self.fragment_concurrency,
+            "http_chunk_size": HTTP_CHUNK_SIZE,
         }
-        format_string = "best"
-        if self.format_mode == "Smart (best combined)":
-            format_string = "bv*+ba/b"
-        elif self.format_mode == "Video + Audio (muxed)":
-            format_string = "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best"
-        elif self.format_mode == "Audio only":
-            format_string = "bestaudio"
-        elif self.format_mode == "Subtitle + metadata":
-            format_string = "best"
-            options.update({"writesubtitles": True, "writeautomaticsub": True})
-        elif self.format_mode == "Playlist (flat)":
-            format_string = "bestaudio/best"
-            options["flat_playlist"] = True
+        format_string, extra = _FORMAT_MAP.get(self.format_mode, _DEFAULT_FORMAT)
         options["format"] = format_string
+        options.update(extra)
         if self.audio_codec and self.format_mode == "Audio only":
             options["postprocessors"] = [{
                 "key": "FFmpegExtractAudio",
@@ -80,38 +134,150 @@ class DownloadTask:
             options["addmetadata"] = True
         if self.keep_thumbnails:
             options["writethumbnail"] = True
-        if self.subtitle_lang:
-            options["subtitleslangs"] = [lang.strip() for lang in self.subtitle_lang.split(",") if lang.strip()]
-        if self.proxy:
-            options["proxy"] = self.proxy.strip()
+        if self._subtitle_langs:
+            options["subtitleslangs"] = list(self._subtitle_langs)
+        if self._proxy:
+            options["proxy"] = self._proxy
         if self.playlist_limit > 0:
             options["max_downloads"] = self.playlist_limit
         return options
 
 
+def _mk_item(text: str) -> QTableWidgetItem:
+    item = QTableWidgetItem(text)
+    item.setFlags(_ITEM_FLAGS)
+    return item
+
+
+@functools.lru_cache(maxsize=None)
+def _base_font() -> QFont:
+    # QFont needs a QApplication, so it is built on first use rather than at import.
+    return QFont("Segoe UI", 10)
+
+
 class DownloadHistory:
+    _STOP = object()
+
     def __init__(self, root: str):
         self.path = os.path.join(root, HISTORY_FILENAME)
-        self._ensure_file()
-
-    def _ensure_file(self) -> None:
-        if not os.path.exists(self.path):
-            with open(self.path, "w", encoding="utf-8") as handle:
-                json.dump([], handle, indent=2)
+        self._records: Deque[Dict] = deque(maxlen=HISTORY_LIMIT)
+        self._load(os.path.join(root, LEGACY_HISTORY_FILENAME))
+        self._fh = open(self.path, "ab", buffering=HISTORY_BUFFER_SIZE)
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    @staticmethod
+    def _encode(record: Dict) -> bytes:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+
+    def _load(self, legacy_path: str) -> None:
+        if os.path.exists(self.path):
+            line_count = 0
+            with open(self.path, "rb") as handle:
+                for line in handle:
+                    if not line.strip():
+                        continue
+                    line_count += 1
+                    try:
+                        self._records.append(orjson.loads(line))
+                    except orjson.JSONDecodeError:
+                        continue
+            if line_count <= HISTORY_LIMIT:
+                return
+        elif os.path.exists(legacy_path):
+            with open(legacy_path, "rb") as handle:
+                self._records.extend(orjson.loads(handle.read()))
+        else:
+            return
+        # Compact the log (or migrate the legacy JSON array) once at startup.
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(b"".join(self._encode(record) for record in self._records))
+        os.replace(tmp_path, self.path)
+
+    def _writer_loop(self) -> None:
+        last_sync = time.monotonic()
+        dirty = False
+        running = True
+        while running:
+            try:
+                batch = [self._queue.get(timeout=HISTORY_DRAIN_TIMEOUT)]
+            except queue.Empty:
+                batch = []
+            while batch and len(batch) < HISTORY_DRAIN_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [item for item in batch if item is not self._STOP]
+            running = len(records) == len(batch)
+            if records:
+                self._fh.write(b"".join(self._encode(record) for record in records))
+                dirty = True
+            now = time.monotonic()
+            if dirty and (not running or now - last_sync >= HISTORY_FSYNC_INTERVAL):
+                self._fh.flush()
+                os.fsync(self._fh.fileno())
+                dirty = False
+                last_sync = now
+        self._fh.close()
 
     def append(self, record: Dict) -> None:
-        self._ensure_file()
-        with open(self.path, "r", encoding="utf-8") as handle:
-            history = json.load(handle)
-        history.append(record)
-        with open(self.path, "w", encoding="utf-8") as handle:
-            json.dump(history[-100:], handle, ensure_ascii=False, indent=2)
+        self._records.append(record)
+        self._queue.put_nowait(record)
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(self._STOP)
+            self._writer.join()
 
     def tail(self, limit: int = 5) -> List[Dict]:
-        self._ensure_file()
-        with open(self.path, "r", encoding="utf-8") as handle:
-            history = json.load(handle)
-        return history[-limit:]
+        return list(itertools.islice(self._records, max(0, len(self._records) - limit), None))
+
+
+_ydl_local = threading.local()
+HookSlot = List[Optional[Callable[[Dict], None]]]
+
+
+def _get_ydl(options: Dict) -> Tuple[yt_dlp.YoutubeDL, HookSlot]:
+    cache = getattr(_ydl_local, "cache", None)
+    if cache is None:
+        cache = _ydl_local.cache = OrderedDict()
+    key = json.dumps(options, sort_keys=True, default=str)
+    entry = cache.get(key)
+    if entry is not None:
+        cache.move_to_end(key)
+        return entry
+    # yt-dlp may call progress hooks from its fragment worker threads, so the
+    # current task's hook is stored on the instance rather than per thread.
+    slot: HookSlot = [None]
+
+    def _dispatch_progress(info: Dict) -> None:
+        hook = slot[0]
+        if hook is not None:
+            hook(info)
+
+    entry = (yt_dlp.YoutubeDL({**options, "progress_hooks": [_dispatch_progress]}), slot)
+    cache[key] = entry
+    if len(cache) > YDL_CACHE_SIZE:
+        cache.popitem(last=False)[1][0].close()
+    return entry
+
+
+@contextmanager
+def _borrow_ydl(options: Dict, hook: Callable[[Dict], None]) -> Iterator[yt_dlp.YoutubeDL]:
+    if "max_downloads" in options:
+        # yt-dlp counts max_downloads per instance, so capped runs need a fresh one.
+        with yt_dlp.YoutubeDL({**options, "progress_hooks": [hook]}) as ydl:
+            yield ydl
+        return
+    ydl, slot = _get_ydl(options)
+    slot[0] = hook
+    try:
+        yield ydl
+    finally:
+        slot[0] = None
 
 
 class WorkerSignals(QObject):
@@ -120,19 +286,19 @@ class WorkerSignals(QObject):
     errored = pyqtSignal(int, str)
 
 
-class DownloadWorker(QRunnable):
-    def __init__(self, task: DownloadTask):
-        super().__init__()
+class DownloadWorker:
+    def __init__(self, task: DownloadTask, signals: WorkerSignals):
         self.task = task
-        self.signals = WorkerSignals()
+        self.signals = signals
         self.task.status = "Running"
+        self._last_emit = 0.0
+        self._last_percent = -1.0
 
     def run(self) -> None:
         self.task.progress_label = "Starting"
-        options = self.task.build_options()
-        options["progress_hooks"] = [self._progress_hook]
         try:
-            with yt_dlp.YoutubeDL(options) as ydl:
+            options = self.task.build_options()
+            with _borrow_ydl(options, self._progress_hook) as ydl:
                 ydl.download([self.task.url])
         except Exception as exc:  # pylint: disable=broad-except
             self.signals.errored.emit(self.task.id, str(exc))
@@ -140,10 +306,27 @@ class DownloadWorker(QRunnable):
             self.signals.finished.emit(self.task.id, self.task.url)
 
     def _progress_hook(self, info: Dict) -> None:
+        now = time.monotonic()
+        status = info.get("status", "")
+        percent = info.get("percent")
+        if percent is None:
+            total_bytes = info.get("total_bytes") or info.get("total_bytes_estimate")
+            downloaded = info.get("downloaded_bytes")
+            if total_bytes and downloaded is not None:
+                percent = downloaded * 100.0 / total_bytes
+        if (
+            status not in TERMINAL_STATUSES
+            and now - self._last_emit <= PROGRESS_EMIT_INTERVAL
+            and (percent is None or abs(percent - self._last_percent) < PROGRESS_EMIT_STEP)
+        ):
+            return
+        self._last_emit = now
+        if percent is not None:
+            self._last_percent = percent
         payload = {
             "task_id": self.task.id,
-            "status": info.get("status", ""),
-            "percent": info.get("percent"),
+            "status": status,
+            "percent": percent,
             "filename": info.get("filename"),
             "eta": info.get("eta"),
             "speed": info.get("speed"),
@@ -157,26 +340,38 @@ class DownloaderWindow(QMainWindow):
         self.setWindowTitle("Artemis Video Suite")
         self.resize(1100, 720)
         self.queue: List[DownloadTask] = []
-        self.thread_pool = QThreadPool()
+        self._task_index: Dict[int, DownloadTask] = {}
         self.history = DownloadHistory(os.getcwd())
         self.next_task_id = 1
+        self._row_of: Dict[int, int] = {}
+        self._emitter = WorkerSignals(self)
+        self._emitter.progress.connect(self._handle_progress)
+        self._emitter.finished.connect(self._handle_finish)
+        self._emitter.errored.connect(self._handle_error)
+        self._log_buf: List[str] = []
+        self._history_pending = False
+        self._pending_state: Dict[int, Dict] = {}
+        self._last_render: Dict[int, float] = {}
         self._build_ui()
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_timer.timeout.connect(self._flush_pending)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start()
+        # One pool sized for the spin box maximum; _dispatch_waiting enforces the
+        # current value so changing it never strands work on a second pool.
+        self._waiting: Deque[int] = deque()
+        self._active: Set[int] = set()
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency_spin.maximum(), thread_name_prefix="ydl")
+        QCoreApplication.instance().aboutToQuit.connect(self._shutdown)
 
     def _build_ui(self) -> None:
-        base_font = QFont("Segoe UI", 10)
-        self.setFont(base_font)
-        self.setStyleSheet("""
-            QWidget { background-color: #0f1117; color: #f0f6ff; }
-            QLineEdit, QPlainTextEdit, QSpinBox, QComboBox { background-color: #1d2230; border: 1px solid #323c55; border-radius: 6px; padding: 4px; }
-            QTableWidget { gridline-color: #2f3649; }
-            QPushButton { background-color: #5c6cff; border-radius: 6px; padding: 8px 16px; color: white; }
-            QPushButton:hover { background-color: #4a54e1; }
-            QPushButton:pressed { background-color: #3c44bb; }
-        """)
+        self.setFont(_base_font())
+        self.setStyleSheet(_STYLE_SHEET)
         central = QWidget()
         main_layout = QVBoxLayout()
         header = QLabel("Artemis · yt-dlp download cockpit")
-        header.setStyleSheet("font-size: 24px; font-weight: 600; color: #c8d7ff;")
+        header.setStyleSheet(_HEADER_STYLE)
         main_layout.addWidget(header)
         cards = QHBoxLayout()
         cards.addLayout(self._build_controls_card())
@@ -242,6 +437,13 @@ class DownloaderWindow(QMainWindow):
         playlist_layout.addWidget(QLabel("Playlist download limit (0 = all):"))
         playlist_layout.addWidget(self.playlist_spin)
         group_layout.addLayout(playlist_layout)
+        fragments_layout = QHBoxLayout()
+        self.fragments_spin = QSpinBox()
+        self.fragments_spin.setRange(1, 16)
+        self.fragments_spin.setValue(DEFAULT_FRAGMENT_CONCURRENCY)
+        fragments_layout.addWidget(QLabel("Parallel fragments per download:"))
+        fragments_layout.addWidget(self.fragments_spin)
+        group_layout.addLayout(fragments_layout)
         button_row = QHBoxLayout()
         add_btn = QPushButton("Add to queue")
         add_btn.clicked.connect(self._add_to_queue)
@@ -274,10 +476,11 @@ class DownloaderWindow(QMainWindow):
         controls.addWidget(clear_btn)
         group_layout.addLayout(controls)
         log_label = QLabel("Console log")
-        log_label.setStyleSheet("font-weight: 600; color: #b6c4ff;")
+        log_label.setStyleSheet(_SECTION_LABEL_STYLE)
         group_layout.addWidget(log_label)
         self.log_output = QPlainTextEdit()
         self.log_output.setReadOnly(True)
+        self.log_output.setMaximumBlockCount(LOG_MAX_BLOCKS)
         self.log_output.setFixedHeight(120)
         group_layout.addWidget(self.log_output)
         history_btn = QPushButton("Refresh history preview")
@@ -307,8 +510,7 @@ class DownloaderWindow(QMainWindow):
             self.output_input.setText(target)
 
     def _add_to_queue(self) -> None:
-        raw = self.url_input.toPlainText().splitlines()
-        urls = [line.strip() for line in raw if line.strip()]
+        urls = _URL_SPLIT.findall(self.url_input.toPlainText())
         if not urls:
             QMessageBox.warning(self, "No URL", "Paste at least one URL before adding to the queue.")
             return
@@ -326,48 +528,98 @@ class DownloaderWindow(QMainWindow):
                 embed_metadata=self.embed_metadata.isChecked(),
                 keep_thumbnails=self.keep_thumbnails.isChecked(),
                 simulate=self.simulate_checkbox.isChecked(),
+                fragment_concurrency=self.fragments_spin.value(),
             )
             task.id = self.next_task_id
             self.next_task_id += 1
             self.queue.append(task)
+            self._task_index[task.id] = task
             self._log(f"Queued {url}")
         self.url_input.clear()
-        self._refresh_queue_table()
+        self._full_rebuild_queue_table()
 
     def _start_queue(self) -> None:
         if not self.queue:
             QMessageBox.information(self, "Nothing to do", "Queue is empty; add some URLs first.")
             return
-        self.thread_pool.setMaxThreadCount(self.concurrency_spin.value())
-        for task in self.queue:
-            if task.status == "Queued":
-                worker = DownloadWorker(task)
-                worker.signals.progress.connect(self._handle_progress)
-                worker.signals.finished.connect(self._handle_finish)
-                worker.signals.errored.connect(self._handle_error)
-                self.thread_pool.start(worker)
-        self._refresh_queue_table()
+        self._waiting = deque(task.id for task in self.queue if task.status == "Queued")
+        self._dispatch_waiting()
+
+    def _dispatch_waiting(self) -> None:
+        limit = self.concurrency_spin.value()
+        self.queue_table.setUpdatesEnabled(False)
+        while self._waiting and len(self._active) < limit:
+            task = self._find_task(self._waiting.popleft())
+            if not task or task.status != "Queued":
+                continue
+            future = self.executor.submit(DownloadWorker(task, self._emitter).run)
+            future.add_done_callback(functools.partial(self._report_crash, task.id))
+            self._active.add(task.id)
+            self._update_task_row(task)
+        self.queue_table.setUpdatesEnabled(True)
 
     def _clear_queue(self) -> None:
         self.queue = [task for task in self.queue if task.status == "Running"]
-        self._refresh_queue_table()
+        self._task_index = {task.id: task for task in self.queue}
+        self._full_rebuild_queue_table()
+
+    def _report_crash(self, task_id: int, future: Future) -> None:
+        # Runs on the worker thread; the signal hands the error back to the GUI.
+        if not future.cancelled() and future.exception() is not None:
+            self._emitter.errored.emit(task_id, str(future.exception()))
+
+    def _shutdown(self) -> None:
+        self._waiting.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.history.close()
 
     def _handle_progress(self, data: Dict) -> None:
         task = self._find_task(data["task_id"]) if data else None
         if not task:
             return
+        if data.get("status") not in TERMINAL_STATUSES and not self._should_render(task.id, time.monotonic()):
+            self._pending_state[task.id] = data
+            return
+        self._pending_state.pop(task.id, None)
+        self._apply_progress(task, data)
+
+    def _should_render(self, task_id: int, now: float) -> bool:
+        if now - self._last_render.get(task_id, 0.0) < PROGRESS_RENDER_INTERVAL:
+            return False
+        self._last_render[task_id] = now
+        return True
+
+    def _flush_pending(self) -> None:
+        if not self._pending_state:
+            return
+        now = time.monotonic()
+        due = [task_id for task_id in self._pending_state if self._should_render(task_id, now)]
+        if not due:
+            return
+        self.queue_table.setUpdatesEnabled(False)
+        for task_id in due:
+            data = self._pending_state.pop(task_id)
+            task = self._find_task(task_id)
+            if task:
+                self._apply_progress(task, data)
+        self.queue_table.setUpdatesEnabled(True)
+
+    def _apply_progress(self, task: DownloadTask, data: Dict) -> None:
         percent = data.get("percent")
         task.progress_label = f"{percent:.1f}%" if percent else data.get("status", "")
         task.eta = str(data.get("eta"))
         task.speed = f"{data.get('speed', 0):.2f} {task.status}" if data.get("speed") else ""
         task.status = data.get("status", task.status)
         self._log(f"{task.url} → {task.progress_label} ({task.status})")
-        self._refresh_queue_table()
+        self._update_task_row(task)
 
     def _handle_finish(self, task_id: int, url: str) -> None:
+        self._active.discard(task_id)
         task = self._find_task(task_id)
         if not task:
             return
+        self._pending_state.pop(task_id, None)
+        self._last_render.pop(task_id, None)
         task.status = "Completed"
         task.progress_label = "100%"
         self.history.append({
@@ -377,37 +629,62 @@ class DownloaderWindow(QMainWindow):
             "timestamp": task.id,
         })
         self._log(f"Finished {url}")
-        self._refresh_queue_table()
-        self._dump_history()
+        self._update_task_row(task)
+        self._schedule_history_refresh()
+        self._dispatch_waiting()
 
     def _handle_error(self, task_id: int, message: str) -> None:
+        self._active.discard(task_id)
         task = self._find_task(task_id)
         if not task:
             return
+        self._pending_state.pop(task_id, None)
+        self._last_render.pop(task_id, None)
         task.status = "Failed"
         task.progress_label = "Error"
         self._log(f"Error {task.url}: {message}")
-        self._refresh_queue_table()
+        self._update_task_row(task)
+        self._dispatch_waiting()
 
     def _find_task(self, task_id: int) -> Optional[DownloadTask]:
-        for task in self.queue:
-            if task.id == task_id:
-                return task
-        return None
-
-    def _refresh_queue_table(self) -> None:
-        self.queue_table.setRowCount(0)
-        for task in self.queue:
-            row = self.queue_table.rowCount()
-            self.queue_table.insertRow(row)
-            self.queue_table.setItem(row, 0, QTableWidgetItem(str(task.id)))
-            self.queue_table.setItem(row, 1, QTableWidgetItem(task.url))
-            self.queue_table.setItem(row, 2, QTableWidgetItem(task.format_mode))
-            self.queue_table.setItem(row, 3, QTableWidgetItem(task.status))
-            self.queue_table.setItem(row, 4, QTableWidgetItem(task.progress_label or "—"))
+        return self._task_index.get(task_id)
+
+    def _full_rebuild_queue_table(self) -> None:
+        self.queue_table.setUpdatesEnabled(False)
+        self.queue_table.setRowCount(len(self.queue))
+        self._row_of = {}
+        for row, task in enumerate(self.queue):
+            self.queue_table.setItem(row, 0, _mk_item(str(task.id)))
+            self.queue_table.setItem(row, 1, _mk_item(task.url))
+            self.queue_table.setItem(row, 2, _mk_item(task.format_mode))
+            self.queue_table.setItem(row, 3, _mk_item(task.status))
+            self.queue_table.setItem(row, 4, _mk_item(task.progress_label or "—"))
+            self._row_of[task.id] = row
+        self.queue_table.setUpdatesEnabled(True)
+
+    def _update_task_row(self, task: DownloadTask) -> None:
+        row = self._row_of.get(task.id)
+        if row is None:
+            return
+        self.queue_table.item(row, 3).setText(task.status)
+        self.queue_table.item(row, 4).setText(task.progress_label or "—")
 
     def _log(self, message: str) -> None:
-        self.log_output.appendPlainText(message)
+        self._log_buf.append(message)
+
+    def _flush_log(self) -> None:
+        if self._log_buf:
+            self.log_output.appendPlainText("\n".join(self._log_buf))
+            self._log_buf.clear()
+
+    def _schedule_history_refresh(self) -> None:
+        if not self._history_pending:
+            self._history_pending = True
+            QTimer.singleShot(HISTORY_REFRESH_DELAY_MS, self._do_dump_history)
+
+    def _do_dump_history(self) -> None:
+        self._history_pending = False
+        self._dump_history()
 
     def _dump_history(self) -> None:
         preview = self.history.tail()
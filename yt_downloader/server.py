@@ -1,21 +1,31 @@
-import functools
+import atexit
 import itertools
-import json
 import os
+import queue
+import sys
 import threading
-from collections import Counter, deque
+import time
+from collections import OrderedDict, deque
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
 
-from flask import Flask, jsonify, request, render_template, send_file, abort
+from flask import Flask, Response, request, render_template, send_file, abort
+import orjson
 import yt_dlp
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_DOWNLOAD_DIR = os.path.join(BASE_DIR, "downloads")
 
-HISTORY_FILENAME = "downloads-history.json"
+HISTORY_FILENAME = "downloads-history.jsonl"
+LEGACY_HISTORY_FILENAME = "downloads-history.json"
+HISTORY_LIMIT = 200
+HISTORY_COMPACT_EVERY = 50
+HISTORY_BATCH_SIZE = 20
+HISTORY_BATCH_WINDOW = 0.5
+HISTORY_WRITE_BUFFER = 128 * 1024
 FORMAT_PRESETS = [
     "Smart (best combined)",
     "Video + Audio (muxed)",
@@ -24,6 +34,15 @@ FORMAT_PRESETS = [
     "Playlist (flat)",
 ]
 AUDIO_CODECS = ["mp3", "m4a", "wav", "opus"]
+FORMAT_MODE_TABLE = {
+    "Smart (best combined)": ("bv*+ba/b", {}),
+    "Video + Audio (muxed)": ("bestvideo[ext=mp4]+bestaudio[ext=m4a]/best", {}),
+    "Audio only": ("bestaudio", {}),
+    "Subtitle + metadata": ("best", {"writesubtitles": True, "writeautomaticsub": True}),
+    "Playlist (flat)": ("bestaudio/best", {"flat_playlist": True}),
+}
+DEFAULT_FORMAT_MODE = ("best", {})
+AUDIO_ONLY_EXCLUDED = frozenset(("Audio only", "Playlist (flat)"))
 QUALITY_OPTIONS = [
     {"label": "Auto (best)", "value": "best", "hint": "Fallback to preset logic."},
     {"label": "144p", "value": "bestvideo[height<=144]+bestaudio/best", "hint": "Usable on slow connections."},
@@ -62,41 +81,133 @@ PRESET_DETAILS = [
         "desc": "Lists playlist entries without downloading payloads for quick auditing.",
     },
 ]
+PRESETS_JSON = orjson.dumps(PRESET_DETAILS)
 LOG_LIMIT = 300
+EVENT_STREAM_LIFETIME = 60.0
+EVENT_KEEPALIVE_INTERVAL = 15.0
+EVENT_MIN_INTERVAL = 0.5
+EVENT_RETRY_MS = 2000
+EVENT_MAX_STREAMS = 4
+HOOK_MIN_INTERVAL = 0.2
+HOOK_MIN_STEP = 0.5
 MAX_WORKERS = 12
+PER_HOST_CONCURRENCY = 2
 DEFAULT_CONCURRENCY = 2
+MIN_PRIORITY = 1
+MAX_PRIORITY = 10
+STATUS_QUEUED = sys.intern("Queued")
+STATUS_SCHEDULED = sys.intern("Scheduled")
+STATUS_RUNNING = sys.intern("Running")
+STATUS_COMPLETED = sys.intern("Completed")
+STATUS_FAILED = sys.intern("Failed")
+STATUS_MAP = {
+    "downloading": STATUS_RUNNING,
+    "finished": STATUS_RUNNING,
+    "error": STATUS_FAILED,
+}
+
+
+_iso_cache: Tuple[int, str] = (-1, "")
 
 
 def now_iso() -> str:
-    return datetime.utcnow().isoformat() + "Z"
+    # Second resolution is plenty for task/history timestamps; the pair is swapped atomically.
+    global _iso_cache
+    second = int(time.time())
+    cached_second, cached_iso = _iso_cache
+    if second != cached_second:
+        cached_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+        _iso_cache = (second, cached_iso)
+    return cached_iso
 
 
 class DownloadHistory:
+    _STOP = object()
+
     def __init__(self, root: str):
         self.path = os.path.join(root, HISTORY_FILENAME)
-        self._ensure_file()
-
-    def _ensure_file(self) -> None:
+        self._lock = threading.Lock()
+        self._buf: Deque[Dict] = deque(maxlen=HISTORY_LIMIT)
+        self._ensure_dir()
+        self._load(os.path.join(root, LEGACY_HISTORY_FILENAME))
+        # Only the writer thread touches the file and this mirror of what it has written.
+        self._written: Deque[Dict] = deque(self._buf, maxlen=HISTORY_LIMIT)
+        self._appends_since_compact = 0
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def _ensure_dir(self) -> None:
         directory = os.path.dirname(self.path)
         if directory and not os.path.isdir(directory):
             os.makedirs(directory, exist_ok=True)
-        if not os.path.exists(self.path):
-            with open(self.path, "w", encoding="utf-8") as handle:
-                json.dump([], handle, indent=2)
+
+    def _load(self, legacy_path: str) -> None:
+        if os.path.exists(self.path):
+            lines = [line for line in Path(self.path).read_bytes().splitlines() if line.strip()]
+            for line in lines:
+                try:
+                    self._buf.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    continue
+            if len(lines) > HISTORY_LIMIT:
+                self._compact(self._buf)
+        elif os.path.exists(legacy_path):
+            self._buf.extend(orjson.loads(Path(legacy_path).read_bytes()))
+            self._compact(self._buf)
+
+    def _compact(self, records: Iterable[Dict]) -> None:
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb", buffering=HISTORY_WRITE_BUFFER) as handle:
+            handle.write(b"".join(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in records))
+        os.replace(tmp_path, self.path)
+
+    def _next_batch(self) -> List[object]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + HISTORY_BATCH_WINDOW
+        while len(batch) < HISTORY_BATCH_SIZE and batch[-1] is not self._STOP:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _writer_loop(self) -> None:
+        running = True
+        while running:
+            batch = self._next_batch()
+            records = [item for item in batch if item is not self._STOP]
+            running = len(records) == len(batch)
+            if not records:
+                continue
+            self._written.extend(records)
+            self._appends_since_compact += len(records)
+            try:
+                if self._appends_since_compact >= HISTORY_COMPACT_EVERY:
+                    self._compact(self._written)
+                    self._appends_since_compact = 0
+                else:
+                    with open(self.path, "ab", buffering=0) as handle:
+                        handle.write(b"".join(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in records))
+            except OSError as exc:
+                append_log(f"History write failed: {exc}")
 
     def append(self, record: Dict) -> None:
-        self._ensure_file()
-        with open(self.path, "r", encoding="utf-8") as handle:
-            history = json.load(handle)
-        history.append(record)
-        with open(self.path, "w", encoding="utf-8") as handle:
-            json.dump(history[-200:], handle, ensure_ascii=False, indent=2)
+        with self._lock:
+            self._buf.append(record)
+        self._queue.put_nowait(record)
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(self._STOP)
+            self._writer.join()
 
     def tail(self, limit: int = 8) -> List[Dict]:
-        self._ensure_file()
-        with open(self.path, "r", encoding="utf-8") as handle:
-            history = json.load(handle)
-        return history[-limit:]
+        with self._lock:
+            return list(itertools.islice(self._buf, max(0, len(self._buf) - limit), None))
 
 
 @dataclass
@@ -123,13 +234,19 @@ class DownloadTask:
     priority: int = 3
     quality_filter: str = "best"
     quality_label: str = "Auto (best)"
-    status: str = "Queued"
+    status: str = STATUS_QUEUED
     progress: float = 0.0
     eta: Optional[float] = None
     speed: Optional[float] = None
     message: str = "Queued"
     created_at: str = field(default_factory=now_iso)
     last_update: str = field(default_factory=now_iso)
+    _download_ready: bool = field(default=False, init=False, repr=False)
+    _version: int = field(default=0, init=False, repr=False)
+    _event_seq: int = field(default=0, init=False, repr=False)
+    _last_hook_ts: float = field(default=0.0, init=False, repr=False)
+    _last_hook_pct: float = field(default=-1.0, init=False, repr=False)
+    _cached_dict: Optional[Tuple[int, Dict]] = field(default=None, init=False, repr=False)
 
     def normalize_output(self) -> str:
         target = self.output_dir.strip() or DEFAULT_DOWNLOAD_DIR
@@ -146,24 +263,13 @@ class DownloadTask:
             "simulate": self.simulate,
             "progress_hooks": [],
         }
-        format_string = "best"
-        if self.format_mode == "Smart (best combined)":
-            format_string = "bv*+ba/b"
-        elif self.format_mode == "Video + Audio (muxed)":
-            format_string = "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best"
-        elif self.format_mode == "Audio only":
-            format_string = "bestaudio"
-        elif self.format_mode == "Subtitle + metadata":
-            format_string = "best"
-            options.update({"writesubtitles": True, "writeautomaticsub": True})
-        elif self.format_mode == "Playlist (flat)":
-            format_string = "bestaudio/best"
-            options["flat_playlist"] = True
+        format_string, extras = FORMAT_MODE_TABLE.get(self.format_mode, DEFAULT_FORMAT_MODE)
+        options.update(extras)
         final_format = format_string
         if (
             self.quality_filter
             and self.quality_filter != "best"
-            and self.format_mode not in ("Audio only", "Playlist (flat)")
+            and self.format_mode not in AUDIO_ONLY_EXCLUDED
         ):
             final_format = self.quality_filter
         options["format"] = final_format
@@ -200,7 +306,12 @@ class DownloadTask:
         return options
 
     def to_dict(self) -> Dict:
-        return {
+        # Readers run without task_lock, so the cache is tagged with the version it was built from.
+        version = self._version
+        cached = self._cached_dict
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        data = {
             "id": self.id,
             "url": self.url,
             "format_mode": self.format_mode,
@@ -218,48 +329,103 @@ class DownloadTask:
             "rate_limit": self.rate_limit,
             "quality_filter": self.quality_filter,
             "quality_label": self.quality_label,
-            "download_ready": bool(
-                self.filepath and self.status == "Completed" and os.path.isfile(self.filepath)
-            ),
+            "download_ready": self._download_ready and self.status is STATUS_COMPLETED,
         }
+        self._cached_dict = (version, data)
+        return data
 
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
 app.config["JSON_SORT_KEYS"] = False
+# Only enable behind a proxy that serves X-Sendfile itself; otherwise clients get an empty body.
+app.use_x_sendfile = os.environ.get("USE_X_SENDFILE", "False").lower() == "true"
 
 history = DownloadHistory(BASE_DIR)
+atexit.register(history.close)
 task_counter = itertools.count(1)
 task_lock = threading.Lock()
 tasks: Dict[int, DownloadTask] = {}
-task_order: List[int] = []
+task_order: "OrderedDict[int, None]" = OrderedDict()
+priority_buckets: Dict[int, Deque[int]] = {p: deque() for p in range(MIN_PRIORITY, MAX_PRIORITY + 1)}
+_tasks_snapshot: Tuple[DownloadTask, ...] = ()
 executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+host_active: Dict[str, int] = {}
 current_concurrency = DEFAULT_CONCURRENCY
 active_workers = 0
 log_lines = deque(maxlen=LOG_LIMIT)
+log_total = 0
+events = threading.Condition()
+# Event ids carry a per-process token so a client resuming across a restart
+# gets a full reset instead of a delta against the old process's task ids.
+EVENT_BOOT_ID = os.urandom(4).hex()
+event_seq = 1
+change_marks: Dict[str, int] = {"order": 0, "log": 0, "history": 0}
+open_streams = 0
+
+
+def _raw_json_response(body: bytes) -> Response:
+    return app.response_class(
+        body,
+        mimetype="application/json",
+        headers={"Content-Length": str(len(body))},
+    )
+
+
+def _json_response(payload: object) -> Response:
+    return _raw_json_response(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS))
+
+
+def _mark_changed(*kinds: str, changed_tasks: Iterable[DownloadTask] = ()) -> None:
+    global event_seq
+    with events:
+        event_seq += 1
+        for kind in kinds:
+            change_marks[kind] = event_seq
+        for task in changed_tasks:
+            task._event_seq = event_seq
+        events.notify_all()
 
 
 def append_log(message: str) -> None:
-    timestamp = datetime.utcnow().strftime("%H:%M:%S")
-    log_lines.append(f"[{timestamp}] {message}")
+    global log_total
+    timestamp = time.strftime("%H:%M:%S", time.gmtime())
+    with events:
+        log_lines.append(f"[{timestamp}] {message}")
+        log_total += 1
+    _mark_changed("log")
+
+
+def _publish_snapshot() -> None:
+    # Callers hold task_lock; readers take the tuple as-is without locking.
+    global _tasks_snapshot
+    _tasks_snapshot = tuple(tasks[tid] for tid in task_order)
 
 
 def gather_insights() -> Dict[str, int]:
-    with task_lock:
-        snapshot = list(tasks.values())
-    counter = Counter(task.status for task in snapshot)
-    total = len(snapshot)
-    avg_progress = (
-        sum(task.progress for task in snapshot) / total
-        if total
-        else 0.0
-    )
+    queued = scheduled = running = completed = failed = 0
+    total = 0
+    progress_sum = 0.0
+    for task in _tasks_snapshot:
+        status = task.status
+        if status is STATUS_RUNNING:
+            running += 1
+        elif status is STATUS_QUEUED:
+            queued += 1
+        elif status is STATUS_COMPLETED:
+            completed += 1
+        elif status is STATUS_SCHEDULED:
+            scheduled += 1
+        elif status is STATUS_FAILED:
+            failed += 1
+        progress_sum += task.progress
+        total += 1
     return {
-        "queued": counter.get("Queued", 0),
-        "scheduled": counter.get("Scheduled", 0),
-        "running": counter.get("Running", 0),
-        "completed": counter.get("Completed", 0),
-        "failed": counter.get("Failed", 0),
-        "avg_progress": round(avg_progress, 1),
+        "queued": queued,
+        "scheduled": scheduled,
+        "running": running,
+        "completed": completed,
+        "failed": failed,
+        "avg_progress": round(progress_sum / total, 1) if total else 0.0,
     }
 
 def update_task(task_id: int, **kwargs) -> Optional[DownloadTask]:
@@ -271,6 +437,8 @@ def update_task(task_id: int, **kwargs) -> Optional[DownloadTask]:
             if hasattr(task, key):
                 setattr(task, key, value)
         task.last_update = now_iso()
+        task._version += 1
+        _mark_changed(changed_tasks=(task,))
         return task
 
 
@@ -278,56 +446,96 @@ def try_schedule_next() -> None:
     global active_workers
     to_start: List[DownloadTask] = []
     with task_lock:
-        queued_ids = sorted(
-            (tid for tid in task_order if tid in tasks and tasks[tid].status == "Queued"),
-            key=lambda tid: (-tasks[tid].priority, tasks[tid].created_at),
-        )
-        while active_workers < current_concurrency and queued_ids:
-            tid = queued_ids.pop(0)
-            task = tasks.get(tid)
-            if not task or task.status != "Queued":
-                continue
-            task.status = "Scheduled"
-            task.last_update = now_iso()
-            to_start.append(task)
-            active_workers += 1
+        for priority in range(MAX_PRIORITY, MIN_PRIORITY - 1, -1):
+            bucket = priority_buckets[priority]
+            skipped: List[int] = []
+            while active_workers < current_concurrency and bucket:
+                tid = bucket.popleft()
+                task = tasks.get(tid)
+                if not task or task.status is not STATUS_QUEUED:
+                    continue
+                host = _host_key(task.url)
+                if host_active.get(host, 0) >= PER_HOST_CONCURRENCY:
+                    # Leave it queued so the free slot goes to another host.
+                    skipped.append(tid)
+                    continue
+                host_active[host] = host_active.get(host, 0) + 1
+                task.status = STATUS_SCHEDULED
+                task.last_update = now_iso()
+                task._version += 1
+                to_start.append(task)
+                active_workers += 1
+            bucket.extendleft(reversed(skipped))
+            if active_workers >= current_concurrency:
+                break
+        if to_start:
+            _mark_changed(changed_tasks=to_start)
     for task in to_start:
         executor.submit(_run_task, task)
 
 
-def _progress_hook(task_id: int, info: Dict) -> None:
-    percent = info.get("percent")
-    speed = info.get("speed")
-    eta = info.get("eta")
-    status = info.get("status") or "running"
-    filename = info.get("filename") or info.get("_filename")
-    pct_value = round(percent, 1) if isinstance(percent, (int, float)) else 0.0
-    update_kwargs = {
-        "progress": pct_value,
-        "status": status.capitalize(),
-        "eta": eta,
-        "speed": speed,
-        "message": filename or status,
-    }
-    if filename:
-        update_kwargs["filepath"] = filename
-    update_task(task_id, **update_kwargs)
+def _host_key(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _make_progress_hook(task: DownloadTask) -> Callable[[Dict], None]:
+    task_id = task.id
+
+    def _progress_hook(info: Dict) -> None:
+        percent = info.get("percent")
+        if percent is None:
+            total_bytes = info.get("total_bytes") or info.get("total_bytes_estimate")
+            downloaded = info.get("downloaded_bytes")
+            if total_bytes and downloaded is not None:
+                percent = downloaded * 100.0 / total_bytes
+        status = info.get("status") or "running"
+        pct_value = round(percent, 1) if isinstance(percent, (int, float)) else 0.0
+        now = time.monotonic()
+        # Ticks with an unchanged percent still go through once per interval so
+        # speed and ETA keep moving when the total is unknown or the download stalls.
+        if (
+            status == "downloading"
+            and now - task._last_hook_ts < HOOK_MIN_INTERVAL
+            and abs(pct_value - task._last_hook_pct) < HOOK_MIN_STEP
+        ):
+            return
+        task._last_hook_ts = now
+        task._last_hook_pct = pct_value
+        filename = info.get("filename") or info.get("_filename")
+        update_kwargs = {
+            "progress": pct_value,
+            "status": STATUS_MAP.get(status, STATUS_RUNNING),
+            "eta": info.get("eta"),
+            "speed": info.get("speed"),
+            "message": filename or status,
+        }
+        if filename:
+            update_kwargs["filepath"] = filename
+        update_task(task_id, **update_kwargs)
+
+    return _progress_hook
 
 
 def _run_task(task: DownloadTask) -> None:
     global active_workers
-    append_log(f"Starting {task.url}")
-    update_task(task.id, status="Running", message="Preparing download", progress=0.0)
-    options = task.build_options()
-    options["progress_hooks"] = [functools.partial(_progress_hook, task.id)]
     try:
+        append_log(f"Starting {task.url}")
+        update_task(task.id, status=STATUS_RUNNING, message="Preparing download", progress=0.0)
+        options = task.build_options()
+        options["progress_hooks"] = [_make_progress_hook(task)]
         with yt_dlp.YoutubeDL(options) as ydl:
             ydl.download([task.url])
     except Exception as exc:  # pylint: disable=broad-except
-        update_task(task.id, status="Failed", message=str(exc))
+        update_task(task.id, status=STATUS_FAILED, message=str(exc))
         append_log(f"Failed {task.url}: {exc}")
     else:
-        update_task(task.id, status="Completed", message="Download finished", progress=100.0)
+        update_task(
+            task.id,
+            status=STATUS_COMPLETED,
+            message="Download finished",
+            progress=100.0,
+            _download_ready=bool(task.filepath and os.path.isfile(task.filepath)),
+        )
         history.append({
             "url": task.url,
             "output": task.output_dir,
@@ -337,10 +545,18 @@ def _run_task(task: DownloadTask) -> None:
             "quality": task.quality_filter,
             "timestamp": now_iso(),
         })
+        _mark_changed("history")
         append_log(f"Finished {task.url}")
     finally:
         with task_lock:
             active_workers = max(active_workers - 1, 0)
+            host = _host_key(task.url)
+            remaining = host_active.get(host, 0) - 1
+            if remaining > 0:
+                host_active[host] = remaining
+            else:
+                host_active.pop(host, None)
+            _mark_changed()
         try_schedule_next()
 
 
@@ -365,7 +581,7 @@ def queue_tasks(payload: Dict) -> List[DownloadTask]:
     tags = [segment.strip() for segment in (payload.get("tags") or "").split(",") if segment.strip()]
     notes = payload.get("notes") or ""
     priority_val = int(payload.get("priority") or 3)
-    priority = max(1, min(priority_val, 10))
+    priority = max(MIN_PRIORITY, min(priority_val, MAX_PRIORITY))
     quality_filter = payload.get("quality_filter") or QUALITY_OPTIONS[0]["value"]
     quality_label = payload.get("quality_label") or QUALITY_OPTIONS[0]["label"]
     created: List[DownloadTask] = []
@@ -396,21 +612,26 @@ def queue_tasks(payload: Dict) -> List[DownloadTask]:
                 id=tid,
             )
             tasks[tid] = task
-            task_order.append(tid)
+            task_order[tid] = None
+            priority_buckets[priority].append(tid)
             created.append(task)
             append_log(f"Queued {url}")
+        _publish_snapshot()
+        _mark_changed("order", changed_tasks=created)
     return created
 
 
 def clear_completed_tasks() -> int:
     removed = 0
     with task_lock:
-        to_remove = [tid for tid, task in tasks.items() if task.status in ("Completed", "Failed")]
+        to_remove = [tid for tid, task in tasks.items() if task.status is STATUS_COMPLETED or task.status is STATUS_FAILED]
         for tid in to_remove:
             tasks.pop(tid, None)
-            if tid in task_order:
-                task_order.remove(tid)
+            task_order.pop(tid, None)
             removed += 1
+        if removed:
+            _publish_snapshot()
+            _mark_changed("order")
     if removed:
         append_log(f"Cleared {removed} finished task(s)")
     return removed
@@ -437,7 +658,7 @@ def api_add_to_queue() -> object:
     payload = request.get_json(force=True)
     tasks_created = queue_tasks(payload)
     try_schedule_next()
-    return jsonify({
+    return _json_response({
         "created": [task.to_dict() for task in tasks_created],
         "queued": len(tasks_created),
     })
@@ -449,7 +670,7 @@ def api_start_queue() -> object:
     concurrency = int(payload.get("concurrency", current_concurrency))
     set_concurrency(concurrency)
     try_schedule_next()
-    return jsonify({
+    return _json_response({
         "status": "scheduled",
         "concurrency": current_concurrency,
     })
@@ -458,33 +679,110 @@ def api_start_queue() -> object:
 @app.route("/api/clear", methods=["POST"])
 def api_clear() -> object:
     removed = clear_completed_tasks()
-    return jsonify({"removed": removed})
+    return _json_response({"removed": removed})
 
 
 @app.route("/api/status", methods=["GET"])
 def api_status() -> object:
-    with task_lock:
-        ordered = [tasks[tid].to_dict() for tid in task_order if tid in tasks]
-    return jsonify({
+    ordered = [task.to_dict() for task in _tasks_snapshot]
+    body = orjson.dumps({
         "tasks": ordered,
         "concurrency": current_concurrency,
         "active_workers": active_workers,
         "history": history.tail(12),
         "insights": gather_insights(),
-        "presets": PRESET_DETAILS,
         "log": list(log_lines),
     })
+    # Splice the static preset list in as pre-encoded bytes instead of re-encoding it per poll.
+    return _raw_json_response(body[:-1] + b',"presets":' + PRESETS_JSON + b"}")
+
+
+def _build_delta(since: int, log_seen: int) -> Tuple[int, int, Dict]:
+    with events:
+        seq = event_seq
+        marks = dict(change_marks)
+        total = log_total
+        full = since <= 0 or since > seq
+        new_count = len(log_lines) if full else min(total - log_seen, len(log_lines))
+        new_log = list(itertools.islice(log_lines, len(log_lines) - new_count, None))
+    snapshot = _tasks_snapshot
+    delta: Dict = {
+        "reset": full,
+        "tasks": [task.to_dict() for task in snapshot if full or task._event_seq > since],
+        "log": new_log,
+        "insights": gather_insights(),
+        "concurrency": current_concurrency,
+        "active_workers": active_workers,
+    }
+    if full or marks["order"] > since:
+        delta["order"] = [task.id for task in snapshot]
+    if full or marks["history"] > since:
+        delta["history"] = history.tail(12)
+    return seq, total, delta
+
+
+def _event_stream(since: int, log_seen: int) -> Iterator[bytes]:
+    yield b"retry: %d\n\n" % EVENT_RETRY_MS
+    deadline = time.monotonic() + EVENT_STREAM_LIFETIME
+    changed = True
+    while True:
+        if changed:
+            since, log_seen, delta = _build_delta(since, log_seen)
+            yield b"id: %s-%d-%d\ndata: %s\n\n" % (EVENT_BOOT_ID.encode(), since, log_seen, orjson.dumps(delta))
+            # Coalesce bursts of progress updates into one event per interval.
+            time.sleep(EVENT_MIN_INTERVAL)
+        else:
+            yield b": keepalive\n\n"
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        with events:
+            changed = events.wait_for(
+                lambda: event_seq != since,
+                timeout=min(remaining, EVENT_KEEPALIVE_INTERVAL),
+            )
+
+
+def _release_stream() -> None:
+    global open_streams
+    with events:
+        open_streams -= 1
+
+
+@app.route("/api/events", methods=["GET"])
+def api_events() -> object:
+    global open_streams
+    # Each stream pins a server thread; past the cap, 204 tells EventSource to
+    # stop reconnecting so the dashboard falls back to polling.
+    with events:
+        if open_streams >= EVENT_MAX_STREAMS:
+            return Response(status=204)
+        open_streams += 1
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_id") or ""
+    boot_id, _, rest = last_id.partition("-")
+    since_text, _, log_text = rest.partition("-")
+    if boot_id == EVENT_BOOT_ID and since_text.isdigit() and log_text.isdigit():
+        since, log_seen = int(since_text), int(log_text)
+    else:
+        since, log_seen = 0, 0
+    response = Response(
+        _event_stream(since, log_seen),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    response.call_on_close(_release_stream)
+    return response
 
 
 @app.route("/download/<int:task_id>")
 def download_task_file(task_id: int) -> object:
     with task_lock:
         task = tasks.get(task_id)
-    if not task or task.status != "Completed" or not task.filepath:
+    if not task or task.status is not STATUS_COMPLETED or not task.filepath:
         abort(404)
     if not os.path.isfile(task.filepath):
         abort(404)
-    return send_file(task.filepath, as_attachment=True)
+    return send_file(task.filepath, as_attachment=True, conditional=True, max_age=0)
 
 
 def run_server() -> None:
@@ -18,7 +18,17 @@ const summaryFailed = document.getElementById("summaryFailed");
 const summaryCompleted = document.getElementById("summaryCompleted");
 
 const form = document.getElementById("configForm");
+const LOG_LIMIT = 300;
+const STREAM_WATCHDOG_MS = 5000;
 let refreshHandle = null;
+let eventSource = null;
+let streamWatchdog = null;
+const liveState = {
+  tasks: new Map(),
+  order: [],
+  history: [],
+  log: [],
+};
 
 function showToast(message) {
   toast.textContent = message;
@@ -36,21 +46,103 @@ async function fetchStatus() {
       throw new Error("Unable to reach the server");
     }
     const data = await response.json();
-    renderQueue(data.tasks);
-    renderHistory(data.history);
-    renderLog(data.log);
-    renderStats(data.insights);
-    queueCount.textContent = `${data.tasks.length} queued`;
-    activeWorkers.textContent = data.active_workers;
-    concurrencyValue.textContent = data.concurrency;
-    if (summaryWorkers) {
-      summaryWorkers.textContent = data.active_workers;
-    }
+    renderStatus(data);
   } catch (error) {
     console.error(error);
   }
 }
 
+function renderStatus(data) {
+  renderQueue(data.tasks);
+  renderHistory(data.history);
+  renderLog(data.log);
+  renderStats(data.insights);
+  queueCount.textContent = `${data.tasks.length} queued`;
+  activeWorkers.textContent = data.active_workers;
+  concurrencyValue.textContent = data.concurrency;
+  if (summaryWorkers) {
+    summaryWorkers.textContent = data.active_workers;
+  }
+}
+
+function applyDelta(delta) {
+  if (delta.reset) {
+    liveState.tasks.clear();
+    liveState.log = [];
+  }
+  delta.tasks.forEach((task) => liveState.tasks.set(task.id, task));
+  if (delta.order) {
+    liveState.order = delta.order;
+    const live = new Set(delta.order);
+    for (const id of liveState.tasks.keys()) {
+      if (!live.has(id)) {
+        liveState.tasks.delete(id);
+      }
+    }
+  }
+  if (delta.history) {
+    liveState.history = delta.history;
+  }
+  liveState.log = liveState.log.concat(delta.log).slice(-LOG_LIMIT);
+  renderStatus({
+    tasks: liveState.order.map((id) => liveState.tasks.get(id)).filter(Boolean),
+    history: liveState.history,
+    log: liveState.log,
+    insights: delta.insights,
+    active_workers: delta.active_workers,
+    concurrency: delta.concurrency,
+  });
+}
+
+function startPolling() {
+  if (refreshHandle === null) {
+    fetchStatus();
+    refreshHandle = window.setInterval(fetchStatus, 2400);
+  }
+}
+
+function fallBackToPolling() {
+  window.clearTimeout(streamWatchdog);
+  if (eventSource !== null) {
+    eventSource.close();
+    eventSource = null;
+  }
+  startPolling();
+}
+
+function armStreamWatchdog() {
+  // Every (re)connect is answered with an event straight away; silence means a
+  // buffering proxy or a stuck reconnect, so switch to polling.
+  window.clearTimeout(streamWatchdog);
+  streamWatchdog = window.setTimeout(fallBackToPolling, STREAM_WATCHDOG_MS);
+}
+
+function connectEvents() {
+  if (!window.EventSource) {
+    startPolling();
+    return;
+  }
+  eventSource = new EventSource("/api/events");
+  armStreamWatchdog();
+  eventSource.onmessage = (event) => {
+    window.clearTimeout(streamWatchdog);
+    applyDelta(JSON.parse(event.data));
+  };
+  eventSource.onerror = () => {
+    if (eventSource.readyState === EventSource.CLOSED) {
+      fallBackToPolling();
+    } else {
+      armStreamWatchdog();
+    }
+  };
+}
+
+async function refreshStatus() {
+  if (eventSource === null) {
+    await fetchStatus();
+  }
+}
+
 function renderQueue(tasks) {
   if (!tasks.length) {
     queueBody.innerHTML = '<tr><td colspan="6" class="empty">No tasks queued</td></tr>';
@@ -184,7 +276,7 @@ async function submitQueueEntry() {
     }
     document.getElementById("urlList").value = "";
     showToast("Queued successfully");
-    await fetchStatus();
+    await refreshStatus();
   } catch (error) {
     console.error(error);
     showToast("Failed to queue items");
@@ -199,7 +291,7 @@ async function startDownloads() {
       body: JSON.stringify({ concurrency: Number(concurrencyInput.value) }),
     });
     showToast("Workers updated");
-    await fetchStatus();
+    await refreshStatus();
   } catch (error) {
     console.error(error);
     showToast("Unable to start downloads");
@@ -210,7 +302,7 @@ async function clearCompleted() {
   try {
     await fetch("/api/clear", { method: "POST" });
     showToast("Cleared finished tasks");
-    await fetchStatus();
+    await refreshStatus();
   } catch (error) {
     console.error(error);
     showToast("Clear request failed");
@@ -231,6 +323,5 @@ document.getElementById("startBtn").addEventListener("click", startDownloads);
 document.getElementById("clearBtn").addEventListener("click", clearCompleted);
 
 document.addEventListener("DOMContentLoaded", () => {
-  fetchStatus();
-  refreshHandle = window.setInterval(fetchStatus, 2400);
+  connectEvents();
 });